@@ -0,0 +1,225 @@
+import argparse
+import glob
+import json
+import os
+import re
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+# --- Configuration ---
+default_log_pattern = 'ipfs_throughput_log_*.csv'
+batch_sizes = [1, 2, 4, 8, 16, 32]
+
+# Calls that a batched access API could aggregate, and the log fields a batch must share.
+# grantAccess relies on msg.sender being the document owner, and an owner only has the personal and
+# financial grants of one loan at hand, so its batches stay within a flow (at most 2 calls). The
+# harness cycles every flow through the same few user accounts, so batching them by sender alone
+# would join grants from unrelated loans minutes apart. The bank sends every requestUserAccess and
+# can batch them freely.
+batch_keys = {
+    'grantAccess': ['Sender', 'Flow'],
+    'requestUserAccess': ['Sender'],
+}
+
+intrinsic_tx_gas = 21000        # Base cost paid once per transaction, shared by every call in a batch
+multicall_overhead_gas = 2600   # Extra gas per aggregated call for the dispatch loop / internal call
+default_block_gas_limit = 30000000
+# Transactions the JS harness keeps in flight (concurrentTransactions in stresstesting/fin-test.js).
+# Blocks in the logs fill to about this many transactions because of the client, not the chain.
+harness_concurrency = 50
+
+
+def load_log(csv_file_path):
+    df_log = pd.read_csv(csv_file_path, on_bad_lines='skip')
+    df_log = df_log[df_log['Status'] == 'SUCCESS'].copy()
+    for column in ['StartTime', 'EndTime', 'BlockNumber', 'GasUsed']:
+        df_log[column] = pd.to_numeric(df_log[column], errors='coerce')
+    df_log['Flow'] = df_log['TxID'].str.extract(r'_(\d+)$', expand=False)
+    return df_log.dropna(subset=['StartTime', 'BlockNumber', 'GasUsed']).sort_values('StartTime', kind='stable')
+
+
+def load_results_json(csv_file_path):
+    """Finds the results JSON written by the same run (results_<flows>_flows.json), if present."""
+    match = re.search(r'_(\d+)\.csv$', csv_file_path)
+    if not match:
+        return {}
+    json_file_path = os.path.join(os.path.dirname(csv_file_path), f'results_{match.group(1)}_flows.json')
+    if not os.path.exists(json_file_path):
+        return {}
+    with open(json_file_path, 'r') as f:
+        return json.load(f)
+
+
+def replay_batched(df_log, batch_size, keys=batch_keys):
+    """
+    Replays the recorded calls grouped into transactions of up to `batch_size` calls and returns
+    (transaction count, total gas). Each call keeps its measured execution gas; the intrinsic
+    cost is paid once per batch and each aggregated call pays the multicall overhead.
+    """
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be at least 1, got {batch_size}")
+    batchable = df_log['Method'].isin(keys)
+    singles = df_log[~batchable]
+    tx_count = len(singles)
+    total_gas = singles['GasUsed'].sum()
+
+    for method, fields in keys.items():
+        for _, calls in df_log[df_log['Method'] == method].groupby(fields, sort=False):
+            call_count = len(calls)
+            batches = -(-call_count // batch_size)
+            execution_gas = (calls['GasUsed'] - intrinsic_tx_gas).sum()
+            # A batch left with a single call is sent as a plain transaction without the dispatch overhead
+            remainder = call_count % batch_size
+            aggregated = 0 if batch_size == 1 else call_count - (remainder if remainder == 1 else 0)
+            overhead = multicall_overhead_gas * aggregated
+            tx_count += batches
+            total_gas += batches * intrinsic_tx_gas + execution_gas + overhead
+    return int(tx_count), float(total_gas)
+
+
+def throughput_curve(csv_file_path, sizes=batch_sizes, block_gas_limit=default_block_gas_limit,
+                     client_concurrency=harness_concurrency):
+    """
+    Projects calls per second for each batch size K as the lower of two bounds:
+    - gas: blocks of `block_gas_limit` every block time, filled with calls at the batched gas per call;
+    - client: `client_concurrency` transactions in flight, each carrying K calls, with the per-transaction
+      confirmation time measured in the recorded run (the run's TPS scaled by concurrency and calls/tx).
+    The confirmation time is assumed not to change with K. Where the client bound applies, the gain is
+    therefore just the calls per transaction and says nothing about block packing.
+    """
+    sizes = sorted(set([1] + list(sizes))) # K=1 is the baseline for savings and gains
+    df_log = load_log(csv_file_path)
+    results = load_results_json(csv_file_path)
+    calls = len(df_log)
+
+    per_block_gas = df_log.groupby('BlockNumber')['GasUsed'].sum()
+    per_block = per_block_gas.index
+    block_time_ms = results.get('averageBlockTimeMs')
+    if not block_time_ms:
+        block_span = per_block.max() - per_block.min()
+        block_time_ms = (df_log['EndTime'].max() - df_log['EndTime'].min()) / max(block_span, 1)
+    measured_tps = results.get('overallTps')
+    if not measured_tps:
+        measured_tps = calls / ((df_log['EndTime'].max() - df_log['StartTime'].min()) / 1000)
+
+    curve = []
+    for batch_size in sizes:
+        tx_count, total_gas = replay_batched(df_log, batch_size)
+        calls_per_tx = calls / tx_count
+        gas_per_call = total_gas / calls
+
+        gas_bound_tps = block_gas_limit / gas_per_call / (block_time_ms / 1000)
+        # At K=1 every transaction is one call, so the measured TPS is the client's transaction rate
+        client_bound_tps = measured_tps * client_concurrency / harness_concurrency * calls_per_tx
+        curve.append({
+            'batch_size': batch_size,
+            'transactions': tx_count,
+            'total_gas': total_gas,
+            'gas_per_call': gas_per_call,
+            'calls_per_tx': calls_per_tx,
+            'gas_bound_tps': gas_bound_tps,
+            'client_bound_tps': client_bound_tps,
+            'binding_limit': 'gas' if gas_bound_tps < client_bound_tps else 'client',
+            'projected_tps': min(gas_bound_tps, client_bound_tps),
+        })
+
+    baseline = curve[0]
+    for point in curve:
+        point['gas_saved_pct'] = (1 - point['total_gas'] / baseline['total_gas']) * 100
+        point['tps_gain'] = point['projected_tps'] / baseline['projected_tps']
+
+    return {
+        'log': csv_file_path,
+        'calls': calls,
+        'measured_tps': measured_tps,
+        'block_time_ms': block_time_ms,
+        'block_gas_limit': block_gas_limit,
+        'measured_block_gas_mean': float(per_block_gas.mean()),
+        'measured_block_gas_max': float(per_block_gas.max()),
+        'client_concurrency': client_concurrency,
+        'gas_per_call_by_method': df_log.groupby('Method')['GasUsed'].mean().to_dict(),
+        'curve': curve,
+    }
+
+
+def plot_curves(reports, filename):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    colors = plt.cm.tab10.colors
+    for i, report in enumerate(reports):
+        points = report['curve']
+        label = os.path.splitext(os.path.basename(report['log']))[0]
+        ax.plot([p['batch_size'] for p in points], [p['projected_tps'] for p in points],
+                marker='o', linestyle='-', linewidth=2, markersize=8, label=label, color=colors[i % len(colors)])
+    ax.set_xscale('log', base=2)
+    sizes = [p['batch_size'] for p in reports[0]['curve']]
+    ax.set_xticks(sizes)
+    ax.set_xticklabels([str(k) for k in sizes])
+    ax.set_title('Projected Throughput vs Access-Grant Batch Size')
+    ax.set_xlabel('Calls per Transaction (K)')
+    ax.set_ylabel('Projected Calls Per Second')
+    ax.legend(title="Run")
+    ax.grid(True, linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    plt.savefig(filename)
+    print(f"Plot saved as '{filename}'")
+
+
+def batch_size_argument(value):
+    batch_size = int(value)
+    if batch_size < 1:
+        raise argparse.ArgumentTypeError(f"batch sizes must be at least 1, got {batch_size}")
+    return batch_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="What-if analysis for batching grantAccess/requestUserAccess calls.")
+    parser.add_argument('logs', nargs='*', help=f"IPFS throughput logs (default: all '{default_log_pattern}')")
+    parser.add_argument('--sizes', type=batch_size_argument, nargs='+', default=batch_sizes,
+                        help="Batch sizes K to evaluate")
+    parser.add_argument('--block-gas-limit', type=int, default=default_block_gas_limit)
+    parser.add_argument('--client-concurrency', type=int, default=harness_concurrency,
+                        help="Transactions the client keeps in flight (default: the harness's concurrentTransactions)")
+    parser.add_argument('--output', default='batch_grant_curve.json', help="Result JSON file")
+    parser.add_argument('--plot', action='store_true', help="Also save the throughput-vs-K plot")
+    args = parser.parse_args()
+
+    log_paths = args.logs or sorted(glob.glob(default_log_pattern))
+    reports = []
+    for csv_file_path in log_paths:
+        if not os.path.exists(csv_file_path):
+            print(f"Error: CSV file not found: {csv_file_path}. Skipping.")
+            continue
+        report = throughput_curve(csv_file_path, args.sizes, args.block_gas_limit, args.client_concurrency)
+        reports.append(report)
+
+        print(f"\n--- {csv_file_path}: {report['calls']} calls, measured {report['measured_tps']:.2f} TPS, "
+              f"{report['block_time_ms']:.0f} ms blocks, block gas {report['measured_block_gas_mean']:.0f} mean / "
+              f"{report['measured_block_gas_max']:.0f} max of {report['block_gas_limit']} ---")
+        print(f"{'K':>3} {'Txs':>8} {'Gas/Call':>9} {'Saved':>7} {'Gas-Bound':>10} {'Client-Bound':>13} "
+              f"{'Limit':>7} {'Gain':>6} {'Projected TPS':>14}")
+        for p in report['curve']:
+            print(f"{p['batch_size']:>3} {p['transactions']:>8} {p['gas_per_call']:>9.0f} "
+                  f"{p['gas_saved_pct']:>6.1f}% {p['gas_bound_tps']:>10.1f} {p['client_bound_tps']:>13.2f} "
+                  f"{p['binding_limit']:>7} {p['tps_gain']:>5.2f}x {p['projected_tps']:>14.2f}")
+        client_bound = [p['batch_size'] for p in report['curve'] if p['binding_limit'] == 'client']
+        if client_bound:
+            gas_bound = [p['gas_bound_tps'] for p in report['curve']]
+            print(f"Note: for K in {client_bound} the client bound applies, so Gain is only calls per transaction "
+                  f"at an unchanged confirmation time, not a packing result. The gas bound is "
+                  f"{min(gas_bound):.1f}-{max(gas_bound):.1f} TPS.")
+
+    if not reports:
+        print(f"Error: no log files found matching '{default_log_pattern}'.")
+        return
+
+    with open(args.output, 'w') as f:
+        json.dump(reports, f, indent=2)
+    print(f"\nResults saved to '{args.output}'")
+
+    if args.plot:
+        plot_curves(reports, 'batch_grant_throughput_curve.png')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from synth_logs import write_slither_results, write_throughput_log
+
+# --- Configuration ---
+plots_dir = os.path.dirname(os.path.abspath(__file__))
+default_data_dir = os.path.join(plots_dir, '.bench-data')        # Generated inputs, reused across runs
+default_history_path = os.path.join(plots_dir, 'bench_history.jsonl')
+log_sizes = [10000, 100000, 1000000]     # Add 10000000 with --rows for the production-scale case
+detector_counts = [100, 1000, 10000]
+log_kinds = ['zkp', 'ipfs']
+repeats = 5
+regression_threshold = 0.2 # Flag benchmarks more than 20% slower than the previous run
+noise_floor_s = 0.005      # Benchmarks faster than this are too noisy to flag
+latency_quantiles = [0.5, 0.9, 0.95, 0.99]
+
+
+def load_slither_module():
+    """Imports slither/slither-to-table.py, whose file name is not a valid module name."""
+    path = os.path.join(plots_dir, '..', 'slither', 'slither-to-table.py')
+    spec = importlib.util.spec_from_file_location('slither_to_table', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# --- Benchmarks ---
+# Each benchmark takes its prepared input and runs the same operation as the analysis scripts.
+def bench_load_log(csv_file_path):
+    return pd.read_csv(csv_file_path)
+
+
+def bench_aggregate_latency(df_log):
+    # Per-method average latency, as in new-plot.py / zkp-plot.py
+    return df_log[df_log['Status'] == 'SUCCESS'].groupby('Method')['LatencyMs'].mean().to_dict()
+
+
+def bench_latency_percentiles(df_log):
+    return df_log[df_log['Status'] == 'SUCCESS'].groupby('Method')['LatencyMs'].quantile(latency_quantiles)
+
+
+def bench_block_aggregates(df_log):
+    return df_log.groupby('BlockNumber').agg(txs=('TxID', 'count'), gas=('GasUsed', 'sum'), size=('BlockSize', 'max'))
+
+
+def bench_load_slither(json_file_path):
+    with open(json_file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def bench_slither_html(data, slither):
+    findings = slither.extract_findings(data)
+    headers = ["ID", "Detector", "Impact", "Confidence", "Contract", "Function", "Description", "Line(s)"]
+    return slither.findings_to_html(findings, headers)
+
+
+log_benchmarks = ['load_log', 'aggregate_latency', 'latency_percentiles', 'block_aggregates']
+slither_benchmarks = ['load_slither', 'slither_html']
+
+
+def measure(func, *args, repeat=repeats):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return {'min_s': min(timings), 'median_s': statistics.median(timings), 'repeat': repeat}
+
+
+def prepare_log(data_dir, kind, rows):
+    path = os.path.join(data_dir, f'{kind}_throughput_log_{rows}.csv')
+    if not os.path.exists(path):
+        print(f"Generating {rows} rows for {kind} log...")
+        write_throughput_log(path, rows, kind, error_rate=0.001)
+    return path
+
+
+def prepare_slither(data_dir, detectors):
+    path = os.path.join(data_dir, f'slither_results_{detectors}.json')
+    if not os.path.exists(path):
+        write_slither_results(path, detectors)
+    return path
+
+
+def run_suite(data_dir, sizes, detectors, kinds, selected=None):
+    os.makedirs(data_dir, exist_ok=True)
+    results = {}
+
+    def wanted(key):
+        return not selected or any(s in key for s in selected)
+
+    def record(name, param, func, *args, repeat=repeats):
+        key = f'{name}[{param}]'
+        if not wanted(key):
+            return
+        results[key] = measure(func, *args, repeat=repeat)
+        print(f"{key:<45} min {results[key]['min_s'] * 1000:>10.2f} ms   "
+              f"median {results[key]['median_s'] * 1000:>10.2f} ms")
+
+    for kind in kinds:
+        for rows in sizes:
+            if not any(wanted(f'{name}[{kind}-{rows}]') for name in log_benchmarks):
+                continue
+            csv_file_path = prepare_log(data_dir, kind, rows)
+            # Fewer repeats for the large inputs so a full run stays within a nightly budget
+            repeat = repeats if rows <= 100000 else 2
+            record('load_log', f'{kind}-{rows}', bench_load_log, csv_file_path, repeat=repeat)
+            df_log = pd.read_csv(csv_file_path)
+            record('aggregate_latency', f'{kind}-{rows}', bench_aggregate_latency, df_log, repeat=repeat)
+            record('latency_percentiles', f'{kind}-{rows}', bench_latency_percentiles, df_log, repeat=repeat)
+            record('block_aggregates', f'{kind}-{rows}', bench_block_aggregates, df_log, repeat=repeat)
+            del df_log
+
+    slither = load_slither_module()
+    for count in detectors:
+        if not any(wanted(f'{name}[{count}]') for name in slither_benchmarks):
+            continue
+        json_file_path = prepare_slither(data_dir, count)
+        record('load_slither', count, bench_load_slither, json_file_path)
+        data = bench_load_slither(json_file_path)
+        record('slither_html', count, bench_slither_html, data, slither)
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=plots_dir,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def previous_run(history_path, machine):
+    """Returns the most recent recorded run from the same machine, if any."""
+    if not os.path.exists(history_path):
+        return None
+    last = None
+    with open(history_path, 'r') as f:
+        for line in f:
+            if line.strip():
+                run = json.loads(line)
+                if run.get('machine') == machine:
+                    last = run
+    return last
+
+
+def compare(results, previous):
+    regressions = []
+    if not previous:
+        return regressions
+    print("\n--- Comparison with previous run "
+          f"({previous.get('revision') or 'unknown revision'}, {previous['timestamp']}) ---")
+    for key, result in results.items():
+        before = previous['results'].get(key)
+        if not before:
+            continue
+        ratio = result['min_s'] / before['min_s'] if before['min_s'] else 1.0
+        flag = ''
+        if ratio > 1 + regression_threshold and result['min_s'] >= noise_floor_s:
+            flag = '  <-- REGRESSION'
+            regressions.append(key)
+        print(f"{key:<45} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis tooling on synthetic inputs.")
+    parser.add_argument('--rows', type=int, nargs='+', default=log_sizes, help="Throughput log sizes")
+    parser.add_argument('--detectors', type=int, nargs='+', default=detector_counts,
+                        help="Detector counts for synthetic Slither reports")
+    parser.add_argument('--kinds', nargs='+', default=log_kinds, choices=log_kinds)
+    parser.add_argument('--bench', nargs='+', help="Only run benchmarks whose name contains one of these")
+    parser.add_argument('--data-dir', default=default_data_dir, help="Cache for generated inputs")
+    parser.add_argument('--history', default=default_history_path, help="JSON lines file of past runs")
+    parser.add_argument('--no-record', action='store_true', help="Do not append this run to the history")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="Exit with status 1 when a benchmark regresses past the threshold")
+    args = parser.parse_args()
+
+    machine = f'{platform.node()}-{platform.machine()}'
+    results = run_suite(args.data_dir, args.rows, args.detectors, args.kinds, args.bench)
+    regressions = compare(results, previous_run(args.history, machine))
+
+    if not args.no_record:
+        run = {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'revision': git_revision(),
+            'machine': machine,
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'results': results,
+        }
+        with open(args.history, 'a') as f:
+            f.write(json.dumps(run) + '\n')
+        print(f"\nRun appended to '{args.history}'")
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {regression_threshold:.0%}.")
+        if args.fail_on_regression:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import argparse
+import base64
+import hashlib
+import json
+import mmap
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+# --- Configuration ---
+# Chunker specs: 'fixed:<bytes>' or 'cdc:<average bytes>'. 262144 is the go-ipfs default chunk size.
+chunker_specs = ['fixed:262144', 'fixed:1048576', 'cdc:16384', 'cdc:65536', 'cdc:262144']
+pool_kinds = ['thread', 'process']
+worker_counts = [1, 2, 4]
+
+# Synthetic mortgage packages: several revisions of each applicant's documents, where every
+# revision re-uploads the package with a few pages edited (the common case for resubmissions)
+synthetic_applicants = 4
+synthetic_revisions = 3
+synthetic_package_mb = 8
+synthetic_edit_fraction = 0.05
+
+cdc_window = 32          # Bytes that influence the gear hash at each position
+cdc_segment = 1 << 20    # Bytes hashed per numpy pass, bounds the per-task working set
+
+# Multicodec / multibase constants for CIDv1 raw leaves
+cid_version = 0x01
+codec_raw = 0x55
+multihash_sha2_256 = 0x12
+sha2_256_length = 0x20
+
+_gear_table = np.random.default_rng(0x1F5).integers(0, 2 ** 32, size=256, dtype=np.uint64).astype(np.uint32)
+
+
+def cid_v1(digest):
+    """Encodes a sha2-256 digest as a base32 CIDv1 with the raw codec (as used for IPFS raw leaves)."""
+    cid_bytes = bytes([cid_version, codec_raw, multihash_sha2_256, sha2_256_length]) + digest
+    return 'b' + base64.b32encode(cid_bytes).decode('ascii').lower().rstrip('=')
+
+
+def fixed_boundaries(length, chunk_size):
+    return list(range(chunk_size, length, chunk_size)) + [length]
+
+
+def cdc_boundaries(buffer, average_size):
+    """
+    Content-defined chunk boundaries using a gear rolling hash. The low 32 bits of the gear hash
+    at byte i only depend on the previous 32 bytes, so the hash is evaluated for a whole segment
+    at once with vectorized shifted adds instead of a per-byte Python loop. A cut is a candidate
+    where the top bits of the hash are zero; min/max chunk sizes are enforced afterwards.
+    """
+    length = len(buffer)
+    min_size, max_size = average_size // 4, average_size * 4
+    mask_bits = max(1, int(np.log2(average_size - min_size)))
+    mask = np.uint32(((1 << mask_bits) - 1) << (32 - mask_bits))
+
+    candidates = []
+    for start in range(0, length, cdc_segment):
+        lead = min(start, cdc_window - 1)
+        segment = np.frombuffer(buffer[start - lead:min(length, start + cdc_segment)], dtype=np.uint8)
+        # Prefix doubling: with S_m[i] = sum_{k<m} gear[i-k] << k, S_2m[i] = S_m[i] + (S_m[i-m] << m),
+        # so the 32-byte window takes log2(32) passes instead of 32
+        h = _gear_table[segment]
+        width = 1
+        while width < cdc_window:
+            h[width:] += h[:-width] << np.uint32(width)
+            width *= 2
+        hits = np.flatnonzero((h[lead:] & mask) == 0)
+        candidates.append(hits + start + 1) # Cut after the matching byte
+    candidates = np.concatenate(candidates) if candidates else np.array([], dtype=np.int64)
+
+    boundaries = []
+    position = 0
+    while length - position > min_size:
+        index = np.searchsorted(candidates, position + min_size)
+        cut = candidates[index] if index < len(candidates) else length
+        cut = min(int(cut), position + max_size, length)
+        boundaries.append(cut)
+        position = cut
+    if position < length:
+        boundaries.append(length)
+    return boundaries
+
+
+def chunk_file(path, chunker, trace=False):
+    """
+    Chunks and hashes one file through an mmap, passing memoryview slices straight to hashlib so
+    no chunk is copied. Returns (bytes, [(digest, chunk_length), ...], peak traced bytes, pid);
+    the peak is only measured when `trace` is set.
+    """
+    kind, size = chunker.split(':')
+    size = int(size)
+    if trace:
+        tracemalloc.start()
+
+    chunks = []
+    length = os.path.getsize(path)
+    if length:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                boundaries = fixed_boundaries(length, size) if kind == 'fixed' else cdc_boundaries(view, size)
+                start = 0
+                for end in boundaries:
+                    chunks.append((hashlib.sha256(view[start:end]).digest(), end - start))
+                    start = end
+            finally:
+                view.release()
+
+    peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    if trace:
+        tracemalloc.stop()
+    return length, chunks, peak, os.getpid()
+
+
+def peak_memory(paths, chunker, pool_kind, workers):
+    """
+    Peak traced memory of all workers together, measured in a separate untimed pass because
+    tracemalloc slows allocation-heavy code. Threads share one tracer, so its peak already covers
+    the concurrent workers; each process traces itself, so the per-process peaks are summed.
+    """
+    if pool_kind == 'thread':
+        tracemalloc.start()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(chunk_file, paths, [chunker] * len(paths)))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+    peak_by_process = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for _, _, peak, pid in executor.map(chunk_file, paths, [chunker] * len(paths), [True] * len(paths)):
+            peak_by_process[pid] = max(peak_by_process.get(pid, 0), peak)
+    return sum(peak_by_process.values())
+
+
+def run_benchmark(paths, chunker, pool_kind, workers):
+    executor_class = ThreadPoolExecutor if pool_kind == 'thread' else ProcessPoolExecutor
+    started = time.perf_counter()
+    with executor_class(max_workers=workers) as executor:
+        outcomes = list(executor.map(chunk_file, paths, [chunker] * len(paths)))
+    elapsed = time.perf_counter() - started
+    peak = peak_memory(paths, chunker, pool_kind, workers)
+
+    total_bytes = sum(outcome[0] for outcome in outcomes)
+    unique = {}
+    chunk_count = 0
+    for _, chunks, _, _ in outcomes:
+        chunk_count += len(chunks)
+        for digest, chunk_length in chunks:
+            unique[digest] = chunk_length
+    unique_bytes = sum(unique.values())
+
+    return {
+        'chunker': chunker,
+        'pool': pool_kind,
+        'workers': workers,
+        'files': len(paths),
+        'total_mb': total_bytes / 2 ** 20,
+        'seconds': elapsed,
+        'throughput_mb_s': total_bytes / 2 ** 20 / elapsed if elapsed else 0.0,
+        'chunks': chunk_count,
+        'unique_chunks': len(unique),
+        'avg_chunk_kb': total_bytes / chunk_count / 1024 if chunk_count else 0.0,
+        'dedup_ratio': total_bytes / unique_bytes if unique_bytes else 1.0,
+        'peak_traced_mb': peak / 2 ** 20,
+        'sample_cid': cid_v1(next(iter(unique))) if unique else None,
+    }
+
+
+def generate_synthetic_packages(directory, seed=0):
+    """Writes revisions of synthetic document packages; later revisions share most content."""
+    rng = random.Random(seed)
+    package_size = synthetic_package_mb * 2 ** 20
+    edit_size = 4096
+    paths = []
+    for applicant in range(synthetic_applicants):
+        content = bytearray(rng.randbytes(package_size))
+        for revision in range(synthetic_revisions):
+            if revision:
+                # Edit a few pages in place and insert a page, shifting everything after it
+                for _ in range(int(package_size * synthetic_edit_fraction / edit_size)):
+                    offset = rng.randrange(0, len(content) - edit_size)
+                    content[offset:offset + edit_size] = rng.randbytes(edit_size)
+                insert_at = rng.randrange(0, len(content))
+                content[insert_at:insert_at] = rng.randbytes(edit_size)
+            path = os.path.join(directory, f'applicant{applicant}_rev{revision}.bin')
+            with open(path, 'wb') as f:
+                f.write(content)
+            paths.append(path)
+    return paths
+
+
+def collect_paths(inputs):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                paths.extend(os.path.join(root, name) for name in sorted(files))
+        elif os.path.exists(item):
+            paths.append(item)
+        else:
+            print(f"Warning: input not found: {item}. Skipping.")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chunking, CID hashing and dedup for document uploads.")
+    parser.add_argument('inputs', nargs='*', help="Files or directories to chunk (default: synthetic packages)")
+    parser.add_argument('--chunkers', nargs='+', default=chunker_specs, help="e.g. fixed:262144 cdc:65536")
+    parser.add_argument('--pools', nargs='+', default=pool_kinds, choices=pool_kinds)
+    parser.add_argument('--workers', type=int, nargs='+', default=worker_counts)
+    parser.add_argument('--output', default='chunk_bench.json', help="Result JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.inputs:
+            paths = collect_paths(args.inputs)
+        else:
+            print(f"Generating {synthetic_applicants * synthetic_revisions} synthetic packages "
+                  f"of ~{synthetic_package_mb} MB...")
+            paths = generate_synthetic_packages(scratch)
+        if not paths:
+            print("Error: no input files to benchmark.")
+            return
+
+        results = []
+        print(f"{'Chunker':<15} {'Pool':<8} {'Workers':>7} {'MB/s':>8} {'Chunks':>8} "
+              f"{'Avg KB':>8} {'Dedup':>6} {'Peak MB':>8}")
+        for chunker in args.chunkers:
+            for pool_kind in args.pools:
+                for workers in args.workers:
+                    r = run_benchmark(paths, chunker, pool_kind, workers)
+                    results.append(r)
+                    print(f"{r['chunker']:<15} {r['pool']:<8} {r['workers']:>7} {r['throughput_mb_s']:>8.1f} "
+                          f"{r['chunks']:>8} {r['avg_chunk_kb']:>8.1f} {r['dedup_ratio']:>6.2f} "
+                          f"{r['peak_traced_mb']:>8.1f}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+import argparse
+import glob
+import heapq
+import json
+import os
+import re
+from collections import OrderedDict, defaultdict
+
+import pandas as pd
+
+# --- Configuration ---
+default_log_pattern = 'ipfs_throughput_log_*.csv'
+cache_sizes = [1, 2, 4, 8, 16, 64, 256, 1024] # Number of CIDs the gateway cache can hold
+policies = ['LRU', 'LFU', 'ARC', 'TTL']
+default_ttl_s = 300.0          # Lifetime of a cached CID under the TTL policy
+default_fetch_ms = 250.0       # Latency of an uncached fetch through the IPFS gateway (/api/v0/cat)
+default_hit_ms = 2.0           # Latency of serving a CID from the cache
+default_block_time_ms = 2700.0 # Used to place indexed events on a time axis (blockNumber * block time)
+# How log accesses map to CIDs: stresstesting/fin-test.js fetches one personal/financial CID pair and
+# uses it "for all flows" ('shared'); 'per-owner' models every document owner uploading their own files
+log_cid_modes = ['shared', 'per-owner']
+
+# Throughput-log methods that make the bank read documents from IPFS after they confirm.
+# None means the CID type is taken from the TxID (P11_GrantPersonal_i / P11_GrantFinancial_i).
+# requestUserAccess only asks for consent, so it does not fetch anything yet.
+log_fetches_by_method = {
+    'grantAccess': None,
+    'approveLoan': ['personal', 'financial'],
+}
+
+# Indexed contract events that record an access to one or both documents. The request events
+# (AccessRequested, AccessRequestedByBank/Mortgage) come from requestUserAccess and are left out
+# for the same reason as in the log trace, so both trace sources count the same fetches:
+# grantAccess -> AccessGranted/AccessRequestGranted, approveLoan -> LoanApproved (or LoanForwarded).
+event_single_cid = {'AccessGranted', 'AccessRequestGranted'}
+# Paired events map to the returnValues keys holding (personal, financial) hashes, in order of preference.
+# MortgageLoanContract overloads LoanForwarded with (cidType, ipfsHash) but passes the two hashes in them.
+event_paired_cids = {
+    'LoanApproved': (['personalCID'], ['financialCID']),
+    'LoanForwarded': (['personalCID', 'cidType'], ['financialCID', 'ipfsHash']),
+    'ReceivedForwardedLoan': (['personalIpfsHash'], ['financialIpfsHash']),
+}
+
+
+# --- Trace Extraction ---
+def trace_from_log(csv_file_path, bank_label='bank', cid_mode='shared'):
+    """
+    Extracts CID accesses (time_ms, requester, cid_type, cid) from an IPFS throughput log.
+    The log does not contain the IPFS hashes themselves. With cid_mode 'shared' every flow uses the
+    same document per type, as fin-test.js does, so the CID is the type ("personal"). With
+    'per-owner' each document is identified by its owner and type ("personal@0xUser"), where the
+    owner of a flow is the sender of its grantAccess rows.
+    """
+    df_log = pd.read_csv(csv_file_path, on_bad_lines='skip')
+    df_log = df_log[(df_log['Status'] == 'SUCCESS') & df_log['Method'].isin(log_fetches_by_method.keys())].copy()
+    if df_log.empty:
+        return []
+    df_log['EndTime'] = pd.to_numeric(df_log['EndTime'], errors='coerce')
+    df_log['Flow'] = df_log['TxID'].str.extract(r'_(\d+)$', expand=False)
+
+    grants = df_log[df_log['Method'] == 'grantAccess']
+    owner_by_flow = grants.drop_duplicates('Flow').set_index('Flow')['Sender'].to_dict()
+
+    trace = []
+    for row in df_log.itertuples(index=False):
+        if row.Method == 'grantAccess':
+            owner = row.Sender
+            match = re.search(r'Grant(\w+?)_\d+$', row.TxID)
+            cid_types = [match.group(1).lower()] if match else ['unknown']
+        else:
+            owner = owner_by_flow.get(row.Flow)
+            if owner is None:
+                continue
+            cid_types = log_fetches_by_method[row.Method]
+        for cid_type in cid_types:
+            cid = cid_type if cid_mode == 'shared' else f'{cid_type}@{owner}'
+            trace.append((row.EndTime, bank_label, cid_type, cid))
+    trace.sort(key=lambda access: access[0])
+    return trace
+
+
+def trace_from_events(events_file_path, block_time_ms=default_block_time_ms):
+    """
+    Extracts CID accesses from decoded contract events exported as a JSON array or JSON lines,
+    in the shape returned by web3's getPastEvents ({event, returnValues, blockNumber, logIndex, ...}).
+    grantAccess emits both AccessGranted and AccessRequestGranted, so accesses are de-duplicated
+    per transaction.
+    """
+    with open(events_file_path, 'r') as f:
+        text = f.read().strip()
+    if text.startswith('['):
+        events = json.loads(text)
+    else:
+        events = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    trace = []
+    seen = set()
+    for event in sorted(events, key=lambda e: (int(e.get('blockNumber', 0)), int(e.get('logIndex', 0)))):
+        name = event.get('event')
+        values = event.get('returnValues', {})
+        if name in event_single_cid:
+            accesses = [(values.get('cidType', 'unknown'), values.get('ipfsHash'))]
+        elif name in event_paired_cids:
+            personal_keys, financial_keys = event_paired_cids[name]
+            accesses = [('personal', next((values[k] for k in personal_keys if values.get(k)), None)),
+                        ('financial', next((values[k] for k in financial_keys if values.get(k)), None))]
+        else:
+            continue
+
+        time_ms = int(event.get('blockNumber', 0)) * block_time_ms
+        for cid_type, cid in accesses:
+            key = (event.get('transactionHash'), cid)
+            if not cid or key in seen:
+                continue
+            seen.add(key)
+            trace.append((time_ms, values.get('requester', '<N/A>'), cid_type, cid))
+    return trace
+
+
+# --- Cache Policies ---
+class LRUCache:
+    def __init__(self, capacity, **kwargs):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+
+    def access(self, key, now):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return True
+        self.entries[key] = True
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return False
+
+
+class LFUCache:
+    """Least-frequently-used eviction, ties broken by least recent use."""
+
+    def __init__(self, capacity, **kwargs):
+        self.capacity = capacity
+        self.frequency = {}
+        self.buckets = defaultdict(OrderedDict)
+        self.min_frequency = 0
+
+    def _touch(self, key):
+        count = self.frequency[key]
+        del self.buckets[count][key]
+        if not self.buckets[count]:
+            del self.buckets[count]
+            if self.min_frequency == count:
+                self.min_frequency = count + 1
+        self.frequency[key] = count + 1
+        self.buckets[count + 1][key] = True
+
+    def access(self, key, now):
+        if key in self.frequency:
+            self._touch(key)
+            return True
+        if len(self.frequency) >= self.capacity:
+            evicted, _ = self.buckets[self.min_frequency].popitem(last=False)
+            if not self.buckets[self.min_frequency]:
+                del self.buckets[self.min_frequency]
+            del self.frequency[evicted]
+        self.frequency[key] = 1
+        self.buckets[1][key] = True
+        self.min_frequency = 1
+        return False
+
+
+class ARCCache:
+    """Adaptive Replacement Cache (Megiddo & Modha) balancing recency (T1) and frequency (T2)."""
+
+    def __init__(self, capacity, **kwargs):
+        self.capacity = capacity
+        self.p = 0
+        self.t1, self.t2 = OrderedDict(), OrderedDict()
+        self.b1, self.b2 = OrderedDict(), OrderedDict()
+
+    def _replace(self, key):
+        if self.t1 and (len(self.t1) > self.p or (key in self.b2 and len(self.t1) == self.p)):
+            old, _ = self.t1.popitem(last=False)
+            self.b1[old] = True
+        else:
+            old, _ = self.t2.popitem(last=False)
+            self.b2[old] = True
+
+    def access(self, key, now):
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = True
+            return True
+        if key in self.t2:
+            self.t2.move_to_end(key)
+            return True
+
+        if key in self.b1:
+            self.p = min(self.capacity, self.p + max(len(self.b2) // max(len(self.b1), 1), 1))
+            self._replace(key)
+            del self.b1[key]
+            self.t2[key] = True
+            return False
+        if key in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // max(len(self.b2), 1), 1))
+            self._replace(key)
+            del self.b2[key]
+            self.t2[key] = True
+            return False
+
+        if len(self.t1) + len(self.b1) == self.capacity:
+            if len(self.t1) < self.capacity:
+                self.b1.popitem(last=False)
+                self._replace(key)
+            else:
+                self.t1.popitem(last=False)
+        elif len(self.t1) + len(self.b1) < self.capacity:
+            total = len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2)
+            if total >= self.capacity:
+                if total == 2 * self.capacity:
+                    self.b2.popitem(last=False)
+                self._replace(key)
+        self.t1[key] = True
+        return False
+
+
+class TTLCache:
+    """Entries expire a fixed time after they were fetched; LRU eviction when full."""
+
+    def __init__(self, capacity, ttl_ms=default_ttl_s * 1000, **kwargs):
+        self.capacity = capacity
+        self.ttl_ms = ttl_ms
+        self.expiry = OrderedDict()
+        self.deadlines = []
+
+    def access(self, key, now):
+        # Drop everything that has expired by `now`; stale heap entries are skipped lazily
+        while self.deadlines and self.deadlines[0][0] <= now:
+            deadline, old = heapq.heappop(self.deadlines)
+            if self.expiry.get(old) == deadline:
+                del self.expiry[old]
+
+        if key in self.expiry:
+            self.expiry.move_to_end(key)
+            return True
+        deadline = now + self.ttl_ms
+        self.expiry[key] = deadline
+        heapq.heappush(self.deadlines, (deadline, key))
+        if len(self.expiry) > self.capacity:
+            self.expiry.popitem(last=False)
+        return False
+
+
+cache_classes = {'LRU': LRUCache, 'LFU': LFUCache, 'ARC': ARCCache, 'TTL': TTLCache}
+
+
+def simulate(trace, sizes=cache_sizes, ttl_s=default_ttl_s, fetch_ms=default_fetch_ms, hit_ms=default_hit_ms):
+    """Replays the trace through every policy and size and returns one result row per pair."""
+    results = []
+    for policy in policies:
+        for size in sizes:
+            cache = cache_classes[policy](size, ttl_ms=ttl_s * 1000)
+            hits = sum(cache.access(cid, time_ms) for time_ms, _, _, cid in trace)
+            results.append({
+                'policy': policy,
+                'cache_size': size,
+                'accesses': len(trace),
+                'hits': hits,
+                'hit_ratio': hits / len(trace) if trace else 0.0,
+                'saved_fetch_latency_s': hits * (fetch_ms - hit_ms) / 1000,
+            })
+    return results
+
+
+def plot_hit_ratio(results, filename):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for policy in policies:
+        rows = [r for r in results if r['policy'] == policy]
+        ax.plot([r['cache_size'] for r in rows], [r['hit_ratio'] * 100 for r in rows],
+                marker='o', linestyle='-', linewidth=2, label=policy)
+    ax.set_xscale('log', base=2)
+    ax.set_title('IPFS Gateway CID Cache Hit Ratio by Policy')
+    ax.set_xlabel('Cache Size (CIDs)')
+    ax.set_ylabel('Hit Ratio (%)')
+    ax.set_ylim(bottom=0, top=105)
+    ax.legend(title="Policy")
+    ax.grid(True, linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    plt.savefig(filename)
+    print(f"Plot saved as '{filename}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate IPFS gateway caches on recorded CID access traces.")
+    parser.add_argument('logs', nargs='*', help=f"IPFS throughput logs (default: all '{default_log_pattern}')")
+    parser.add_argument('--events', action='append', default=[],
+                        help="Decoded contract events (JSON or JSON lines); may be repeated")
+    parser.add_argument('--log-cids', choices=log_cid_modes, default='shared',
+                        help="Log documents share one CID per type (as in fin-test.js) or are per owner")
+    parser.add_argument('--sizes', type=int, nargs='+', default=cache_sizes, help="Cache sizes in CIDs")
+    parser.add_argument('--ttl', type=float, default=default_ttl_s, help="TTL policy lifetime in seconds")
+    parser.add_argument('--fetch-ms', type=float, default=default_fetch_ms, help="Uncached fetch latency (ms)")
+    parser.add_argument('--hit-ms', type=float, default=default_hit_ms, help="Cached fetch latency (ms)")
+    parser.add_argument('--output', default='cid_cache_sim.json', help="Result JSON file")
+    parser.add_argument('--plot', action='store_true', help="Also save a hit-ratio plot per trace")
+    args = parser.parse_args()
+
+    traces = {}
+    for csv_file_path in args.logs or ([] if args.events else sorted(glob.glob(default_log_pattern))):
+        if not os.path.exists(csv_file_path):
+            print(f"Error: CSV file not found: {csv_file_path}. Skipping.")
+            continue
+        traces[csv_file_path] = trace_from_log(csv_file_path, cid_mode=args.log_cids)
+    for events_file_path in args.events:
+        if not os.path.exists(events_file_path):
+            print(f"Error: events file not found: {events_file_path}. Skipping.")
+            continue
+        traces[events_file_path] = trace_from_events(events_file_path)
+
+    if not traces:
+        print("Error: no traces to simulate.")
+        return
+
+    report = {}
+    for source, trace in traces.items():
+        if not trace:
+            print(f"Warning: no CID accesses found in {source}. Skipping.")
+            continue
+        results = simulate(trace, args.sizes, args.ttl, args.fetch_ms, args.hit_ms)
+        unique_cids = len({cid for _, _, _, cid in trace})
+        report[source] = {'accesses': len(trace), 'unique_cids': unique_cids, 'results': results}
+
+        print(f"\n--- {source}: {len(trace)} accesses to {unique_cids} CIDs ---")
+        print(f"{'Policy':<6} {'Size':>6} {'Hit Ratio':>10} {'Saved Latency':>15}")
+        for r in results:
+            print(f"{r['policy']:<6} {r['cache_size']:>6} {r['hit_ratio']:>9.1%} {r['saved_fetch_latency_s']:>14.1f}s")
+
+        if args.plot:
+            base_name = os.path.splitext(os.path.basename(source))[0]
+            plot_hit_ratio(results, f'cid_cache_hit_ratio_{base_name}.png')
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
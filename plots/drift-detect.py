@@ -0,0 +1,302 @@
+import argparse
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# --- Configuration ---
+default_log_pattern = '*_throughput_log_*.csv'
+
+# Share of each series used as the "healthy" reference for CUSUM
+baseline_fraction = 0.1
+# CUSUM slack (k) and decision threshold (h), both in baseline standard deviations
+cusum_k = 0.5
+cusum_h = 8.0
+# PELT penalty multiplier (penalty = multiplier * variance * log(n)) and minimum segment length
+pelt_penalty_multiplier = 2.0
+pelt_min_segment = 10
+# Rolling robust z-score anomaly detection
+rolling_window = 30
+rolling_z_threshold = 6.0
+# Lower bound on the rolling scale, relative to |median|, so near-constant series do not flag tiny shifts
+rolling_scale_floor = 0.01
+# Rolling anomalies shorter than this many consecutive points are reported as isolated spikes
+rolling_min_run = 3
+# Only report changes (step or rolling) of at least this relative size
+min_relative_change = 0.2
+# Direction in which each series gets worse: +1 when an increase degrades, -1 when a decrease does
+# (less gas or data per block means fewer transactions confirmed per block)
+degrading_direction = {'latency_ms': 1, 'block_interval_ms': 1, 'block_gas': -1, 'block_size_bytes': -1}
+
+
+def load_log(csv_file_path):
+    """
+    Loads a throughput log and returns successful transactions ordered by confirmation time.
+    Error rows carry a free-text message and an irregular column count, so they are skipped.
+    """
+    df_log = pd.read_csv(csv_file_path, on_bad_lines='skip')
+    df_log = df_log[df_log['Status'] == 'SUCCESS'].copy()
+    for column in ['StartTime', 'EndTime', 'LatencyMs', 'BlockNumber', 'GasUsed', 'BlockSize']:
+        df_log[column] = pd.to_numeric(df_log[column], errors='coerce')
+    df_log = df_log.dropna(subset=['EndTime', 'LatencyMs', 'BlockNumber'])
+    df_log['BlockNumber'] = df_log['BlockNumber'].astype(np.int64)
+    return df_log.sort_values('EndTime', kind='stable').reset_index(drop=True)
+
+
+def build_series(df_log):
+    """
+    Builds the monitored series with one point per confirmed block. Each entry maps a name to
+    (times_ms, values, blocks), where `blocks` links every point back to its block for attribution.
+    Transactions are sent in concurrent batches that confirm together, so per-transaction latency
+    is strongly autocorrelated; the per-block median is used instead.
+    """
+    per_block = df_log.groupby('BlockNumber').agg(
+        first_seen=('EndTime', 'min'), latency=('LatencyMs', 'median'),
+        gas=('GasUsed', 'sum'), size=('BlockSize', 'max'))
+    blocks = per_block.index.to_numpy()
+    times = per_block['first_seen'].to_numpy()
+
+    series = {'latency_ms': (times, per_block['latency'].to_numpy(dtype=float), blocks)}
+    # The first and last blocks only hold the part of the run that overlapped them, so their
+    # gas and size would read as a drop that has nothing to do with the chain
+    full = slice(1, -1) if len(blocks) > 2 else slice(None)
+    series['block_gas'] = (times[full], per_block['gas'].to_numpy(dtype=float)[full], blocks[full])
+    series['block_size_bytes'] = (times[full], per_block['size'].to_numpy(dtype=float)[full], blocks[full])
+
+    # The logs carry no block timestamps, so the interval is estimated from when the client
+    # first saw each block confirm, normalised by the block-number gap between observations
+    if len(blocks) > 1:
+        interval = np.diff(times) / np.maximum(np.diff(blocks), 1)
+        series['block_interval_ms'] = (times[1:], interval, blocks[1:])
+    return series
+
+
+def cusum_events(values):
+    """
+    Two-sided CUSUM against a baseline taken from the start of the series. After each alarm the
+    detector restarts with the post-change level as its new baseline. Returns (start, alarm) pairs.
+    """
+    n = len(values)
+    events = []
+    start = 0
+    while n - start > 2 * pelt_min_segment:
+        baseline_len = max(pelt_min_segment, int((n - start) * baseline_fraction))
+        reference = values[start:start + baseline_len]
+        mean = reference.mean()
+        std = reference.std() or (abs(mean) * 0.01) or 1.0
+        z = (values[start:] - mean) / std
+
+        # Lindley recursion S_t = max(0, S_{t-1} + x_t - k) in closed form:
+        # S_t = C_t - min(0, min_{j<=t} C_j), with C the cumulative sum of (x - k)
+        upper_c = np.cumsum(z - cusum_k)
+        lower_c = np.cumsum(-z - cusum_k)
+        upper = upper_c - np.minimum(np.minimum.accumulate(upper_c), 0)
+        lower = lower_c - np.minimum(np.minimum.accumulate(lower_c), 0)
+
+        alarms = np.flatnonzero((upper > cusum_h) | (lower > cusum_h))
+        if len(alarms) == 0:
+            break
+        alarm = alarms[0]
+        statistic = upper if upper[alarm] > cusum_h else lower
+        # The change began right after the statistic last sat at zero
+        zeros = np.flatnonzero(statistic[:alarm] == 0)
+        change = zeros[-1] + 1 if len(zeros) else 0
+        events.append((start + change, start + alarm))
+        start += max(alarm, change + 1)
+    return events
+
+
+def pelt_changepoints(values):
+    """
+    PELT search for shifts in the mean under a Gaussian cost. The noise variance is estimated
+    from first differences so that the level shifts being searched for do not inflate it.
+    Returns the indices where each new segment starts.
+    """
+    n = len(values)
+    if n < 2 * pelt_min_segment:
+        return []
+    variance = (1.4826 * np.median(np.abs(np.diff(values))) / np.sqrt(2)) ** 2 or values.var() or 1.0
+    penalty = pelt_penalty_multiplier * variance * np.log(n)
+
+    cumsum = np.concatenate(([0.0], np.cumsum(values)))
+    cumsum_sq = np.concatenate(([0.0], np.cumsum(values ** 2)))
+
+    def segment_cost(starts, end):
+        length = end - starts
+        total = cumsum[end] - cumsum[starts]
+        return (cumsum_sq[end] - cumsum_sq[starts]) - total ** 2 / length
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    last_change = np.zeros(n + 1, dtype=np.int64)
+    candidates = np.array([0], dtype=np.int64)
+
+    for end in range(pelt_min_segment, n + 1):
+        valid = candidates[end - candidates >= pelt_min_segment]
+        if len(valid) == 0:
+            continue
+        costs = best[valid] + segment_cost(valid, end) + penalty
+        arg = np.argmin(costs)
+        best[end] = costs[arg]
+        last_change[end] = valid[arg]
+        # Pruning: drop candidates that can never be optimal again
+        keep = best[candidates] + np.where(end - candidates >= pelt_min_segment,
+                                           segment_cost(candidates, end), 0) <= best[end]
+        candidates = np.append(candidates[keep], end - pelt_min_segment + 1)
+
+    changepoints = []
+    end = n
+    while end > 0:
+        start = last_change[end]
+        if start > 0:
+            changepoints.append(start)
+        end = start
+    return sorted(changepoints)
+
+
+def rolling_anomalies(values):
+    """
+    Flags points whose robust z-score against the trailing window exceeds the threshold and
+    merges consecutive points flagged in the same direction into (start, end) runs, so that a
+    block seen late followed by one seen early does not count as a sustained anomaly.
+    """
+    s = pd.Series(values)
+    window = s.rolling(rolling_window, min_periods=rolling_window // 4)
+    median = window.median().shift(1)
+    mad = (s - median).abs().rolling(rolling_window, min_periods=rolling_window // 4).median().shift(1)
+    # The MAD collapses when most of the window sits in one mode (per-block latency is often
+    # bimodal), so the IQR and a floor relative to the median also bound the scale from below
+    iqr = (window.quantile(0.75) - window.quantile(0.25)).shift(1)
+    scale = np.maximum.reduce([1.4826 * mad, iqr / 1.349, rolling_scale_floor * median.abs()])
+    scale = pd.Series(scale).replace(0, np.nan)
+    z = np.nan_to_num(((s - median) / scale).to_numpy(), nan=0.0)
+
+    runs = []
+    for flagged in (z > rolling_z_threshold, z < -rolling_z_threshold):
+        edges = np.diff(np.concatenate(([0], flagged.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+        runs += list(zip(starts, ends))
+    return sorted(runs)
+
+
+def describe_event(df_log, name, times, values, blocks, detector, start, end):
+    """Summarises one detected event with the methods and senders active around it."""
+    before = values[max(0, start - rolling_window):start]
+    after = values[start:end + 1] if detector == 'rolling_zscore' else values[start:start + rolling_window]
+    before_mean = float(before.mean()) if len(before) else float('nan')
+    after_mean = float(after.mean()) if len(after) else float('nan')
+    change = (after_mean - before_mean) / before_mean if before_mean else float('nan')
+
+    # Attribute the event to the transactions confirmed in the affected blocks
+    block_lo, block_hi = blocks[start], blocks[min(end, len(blocks) - 1)]
+    involved = df_log[(df_log['BlockNumber'] >= block_lo) & (df_log['BlockNumber'] <= block_hi)]
+    origin = df_log['StartTime'].min()
+
+    return {
+        'series': name,
+        'detector': detector,
+        'direction': 'increase' if change > 0 else 'decrease',
+        'degradation': bool(change * degrading_direction.get(name, 1) > 0),
+        'time_ms': float(times[start]),
+        'elapsed_s': float((times[start] - origin) / 1000),
+        'detected_at_ms': float(times[min(end, len(times) - 1)]),
+        'block_range': [int(block_lo), int(block_hi)],
+        'mean_before': before_mean,
+        'mean_after': after_mean,
+        'relative_change': float(change),
+        'methods': involved['Method'].value_counts().to_dict(),
+        'senders': involved['Sender'].value_counts().head(5).to_dict(),
+    }
+
+
+def detect_drift(csv_file_path):
+    """Returns the log, the detected events and the isolated rolling spikes, each sorted by time."""
+    df_log = load_log(csv_file_path)
+    events = []
+    spikes = []
+    for name, (times, values, blocks) in build_series(df_log).items():
+        values = values.astype(float)
+        if len(values) < 2 * pelt_min_segment:
+            continue
+
+        detected = [('cusum', start, alarm) for start, alarm in cusum_events(values)]
+        detected += [('pelt', cp, cp) for cp in pelt_changepoints(values)]
+        detected += [('rolling_zscore', start, end) for start, end in rolling_anomalies(values)]
+        for detector, start, end in detected:
+            event = describe_event(df_log, name, times, values, blocks, detector, start, end)
+            if abs(event['relative_change']) < min_relative_change:
+                continue
+            if detector == 'rolling_zscore' and end - start + 1 < rolling_min_run:
+                spikes.append(event)
+            else:
+                events.append(event)
+
+    events.sort(key=lambda e: (e['time_ms'], e['series']))
+    spikes.sort(key=lambda e: (e['time_ms'], e['series']))
+    return df_log, events, spikes
+
+
+def plot_latency_changepoints(df_log, events, filename):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(15, 6))
+    origin = df_log['StartTime'].min()
+    ax.plot((df_log['EndTime'] - origin) / 1000, df_log['LatencyMs'], linewidth=0.5, color='skyblue')
+    for event in events:
+        if event['series'] == 'latency_ms' and event['detector'] != 'rolling_zscore':
+            color = 'lightcoral' if event['degradation'] else 'darkgreen'
+            ax.axvline(event['elapsed_s'], color=color, linestyle='--', alpha=0.8)
+    ax.set_title('Latency with Detected Change Points')
+    ax.set_xlabel('Elapsed Time (s)')
+    ax.set_ylabel('Latency (ms)')
+    ax.grid(True, linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    plt.savefig(filename)
+    print(f"Plot saved as '{filename}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect drift and anomalies in long throughput logs.")
+    parser.add_argument('logs', nargs='*', help=f"Log CSVs to analyse (default: all '{default_log_pattern}')")
+    parser.add_argument('--plot', action='store_true', help="Also save a latency plot with change points")
+    args = parser.parse_args()
+
+    log_paths = args.logs or sorted(glob.glob(default_log_pattern))
+    if not log_paths:
+        print(f"Error: no log files found matching '{default_log_pattern}'.")
+        return
+
+    for csv_file_path in log_paths:
+        if not os.path.exists(csv_file_path):
+            print(f"Error: CSV file not found: {csv_file_path}. Skipping.")
+            continue
+
+        df_log, events, spikes = detect_drift(csv_file_path)
+        base_name = os.path.splitext(os.path.basename(csv_file_path))[0]
+        output_path = f'drift_events_{base_name}.json'
+        with open(output_path, 'w') as f:
+            json.dump({'log': csv_file_path, 'transactions': len(df_log), 'events': events, 'spikes': spikes},
+                      f, indent=2)
+
+        degradations = [e for e in events if e['degradation']]
+        print(f"\n--- {csv_file_path}: {len(events)} events ({len(degradations)} degradations) ---")
+        for event in events:
+            top_method = next(iter(event['methods']), '<N/A>')
+            print(f"  t={event['elapsed_s']:8.1f}s  {event['series']:<18} {event['detector']:<15} "
+                  f"{event['mean_before']:.1f} -> {event['mean_after']:.1f} "
+                  f"({event['relative_change']:+.0%}), top method: {top_method}")
+        if spikes:
+            per_series = pd.Series([spike['series'] for spike in spikes]).value_counts()
+            print(f"  {len(spikes)} isolated spikes shorter than {rolling_min_run} blocks: "
+                  + ', '.join(f"{series} {count}" for series, count in per_series.items()))
+        print(f"Events saved to '{output_path}'")
+
+        if args.plot:
+            plot_latency_changepoints(df_log, events, f'drift_{base_name}.png')
+
+
+if __name__ == "__main__":
+    main()
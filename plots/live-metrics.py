@@ -0,0 +1,351 @@
+import argparse
+import bisect
+import csv
+import glob
+import os
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Configuration ---
+# Column layout written by stresstesting/fin-test.js and stresstesting/zkp-test.js
+log_columns = ['TxID', 'Method', 'Sender', 'TxHash', 'StartTime', 'EndTime',
+               'LatencyMs', 'BlockNumber', 'Status', 'EstimatedGas', 'GasUsed', 'BlockSize']
+
+default_log_pattern = '*_throughput_log_*.csv'
+default_tps_window_s = 10.0      # Rolling TPS window (seconds of log time)
+default_latency_samples = 2000   # Number of recent successful latencies kept for percentiles
+latency_quantiles = [0.5, 0.9, 0.95, 0.99]
+signature_max_bytes = 4096       # Longest header + first row compared to detect a rewritten log
+
+
+class LogTailer:
+    """
+    Incrementally reads new rows from a growing throughput log CSV.
+    Keeps the byte offset between polls so already-consumed data is never re-read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.inode = None
+        self.runs = 0 # Incremented whenever the file is found rewritten by a new run
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self.partial = b''
+        self.header_seen = False
+        self.signature = b'' # Header plus first data row, identifies the run being followed
+
+    def _rewritten(self, f, stat):
+        # The JS test scripts recreate the log with writeFileSync on every run. By the next poll the
+        # new run may already be longer than the old offset, so the inode and first row are compared too.
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            return True
+        return bool(self.signature) and f.read(len(self.signature)) != self.signature
+
+    def poll(self):
+        """Returns a list of newly completed rows (as lists of fields) since the last poll."""
+        try:
+            f = open(self.path, 'rb')
+        except OSError:
+            return []
+        with f:
+            stat = os.fstat(f.fileno())
+            if self._rewritten(f, stat):
+                if self.inode is not None:
+                    self.runs += 1
+                self.inode = stat.st_ino
+                self._reset()
+            if not self.signature:
+                f.seek(0)
+                head = f.read(signature_max_bytes)
+                second_newline = head.find(b'\n', head.find(b'\n') + 1)
+                if second_newline != -1:
+                    self.signature = head[:second_newline + 1]
+            if stat.st_size == self.offset:
+                return []
+            f.seek(self.offset)
+            chunk = f.read(stat.st_size - self.offset)
+        self.offset += len(chunk)
+
+        data = self.partial + chunk
+        # Keep an incomplete trailing line (writer mid-append) for the next poll
+        last_newline = data.rfind(b'\n')
+        if last_newline == -1:
+            self.partial = data
+            return []
+        self.partial = data[last_newline + 1:]
+
+        lines = data[:last_newline].decode('utf-8', errors='replace').splitlines()
+        rows = []
+        for fields in csv.reader(lines):
+            if not fields:
+                continue
+            if not self.header_seen and fields[0] == log_columns[0]:
+                self.header_seen = True
+                continue
+            rows.append(fields)
+        return rows
+
+
+class RollingMetrics:
+    """
+    Fixed-size rolling windows over the parsed log rows.
+    Memory is bounded by `latency_samples` and `max_window_events`, independent of run length.
+    """
+
+    def __init__(self, tps_window_s=default_tps_window_s, latency_samples=default_latency_samples,
+                 max_window_events=100000):
+        self.tps_window_ms = tps_window_s * 1000
+        self.latencies = deque(maxlen=latency_samples)
+        self.end_times = deque(maxlen=max_window_events)
+        self.lock = threading.Lock()
+
+        self.success_total = 0
+        self.error_total = 0
+        self.success_by_method = {}
+        self.latency_sum_by_method = {}
+        self.last_block = 0
+        self.last_block_size = 0
+        self.latest_end_time = 0.0
+        self.first_end_time = None
+        self.latest_arrival = time.monotonic() # Wall clock when latest_end_time last advanced
+
+    def update(self, rows):
+        with self.lock:
+            for fields in rows:
+                self._add_row(fields)
+            self._expire()
+
+    def _add_row(self, fields):
+        method = fields[1] if len(fields) > 1 else '<unknown>'
+        # Error rows are written with fewer columns (and a free-text message), so only
+        # rows with the full layout and a SUCCESS status are treated as confirmed
+        if len(fields) < len(log_columns) or fields[8] != 'SUCCESS':
+            self.error_total += 1
+            return
+        try:
+            end_time = float(fields[5])
+            latency = float(fields[6])
+        except ValueError:
+            self.error_total += 1
+            return
+
+        self.success_total += 1
+        self.success_by_method[method] = self.success_by_method.get(method, 0) + 1
+        self.latency_sum_by_method[method] = self.latency_sum_by_method.get(method, 0.0) + latency
+        self.latencies.append(latency)
+
+        # Confirmations arrive roughly in EndTime order; keep the window sorted regardless
+        if self.end_times and end_time < self.end_times[-1]:
+            if len(self.end_times) == self.end_times.maxlen:
+                self.end_times.popleft() # deque.insert refuses to grow past maxlen
+            index = bisect.bisect_right(self.end_times, end_time)
+            self.end_times.insert(index, end_time)
+        else:
+            self.end_times.append(end_time)
+        if end_time >= self.latest_end_time:
+            self.latest_end_time = end_time
+            self.latest_arrival = time.monotonic()
+        if self.first_end_time is None or end_time < self.first_end_time:
+            self.first_end_time = end_time
+
+        try:
+            block = int(fields[7])
+            if block >= self.last_block:
+                self.last_block = block
+                self.last_block_size = int(fields[11])
+        except ValueError:
+            pass
+
+    def _log_now(self):
+        """
+        Current position on the log's time axis. Without new confirmations the latest EndTime
+        stops moving, so the wall time since it arrived is added to let the window drain in a stall.
+        """
+        return self.latest_end_time + (time.monotonic() - self.latest_arrival) * 1000
+
+    def _expire(self):
+        cutoff = self._log_now() - self.tps_window_ms
+        while self.end_times and self.end_times[0] < cutoff:
+            self.end_times.popleft()
+
+    def snapshot(self):
+        """Returns a dict of the current rolling metrics."""
+        with self.lock:
+            self._expire()
+            window_s = self.tps_window_ms / 1000
+            if self.end_times:
+                # Confirmations arrive in per-block bursts, so the window length (not the spread of
+                # EndTimes inside it) is the denominator; only a run younger than the window uses its age
+                run_age_s = (self._log_now() - self.first_end_time) / 1000
+                rolling_tps = len(self.end_times) / min(window_s, max(run_age_s, 1.0))
+            else:
+                rolling_tps = 0.0
+
+            sorted_latencies = sorted(self.latencies)
+            percentiles = {}
+            for q in latency_quantiles:
+                if sorted_latencies:
+                    index = min(len(sorted_latencies) - 1, int(q * len(sorted_latencies)))
+                    percentiles[q] = sorted_latencies[index]
+                else:
+                    percentiles[q] = 0.0
+
+            return {
+                'rolling_tps': rolling_tps,
+                'latency_percentiles_ms': percentiles,
+                'latency_window_size': len(sorted_latencies),
+                'success_total': self.success_total,
+                'error_total': self.error_total,
+                'success_by_method': dict(self.success_by_method),
+                'avg_latency_by_method_ms': {
+                    m: self.latency_sum_by_method[m] / n for m, n in self.success_by_method.items() if n
+                },
+                'last_block': self.last_block,
+                'last_block_size': self.last_block_size,
+            }
+
+
+def format_prometheus(snapshot, log_path):
+    """Renders a metrics snapshot in the Prometheus text exposition format."""
+    log_label = os.path.basename(log_path).replace('"', '')
+    lines = [
+        '# HELP stress_rolling_tps Confirmed transactions per second over the rolling window.',
+        '# TYPE stress_rolling_tps gauge',
+        f'stress_rolling_tps{{log="{log_label}"}} {snapshot["rolling_tps"]:.4f}',
+        '# HELP stress_latency_ms Latency quantiles over the most recent successful transactions.',
+        '# TYPE stress_latency_ms summary',
+    ]
+    for q, value in snapshot['latency_percentiles_ms'].items():
+        lines.append(f'stress_latency_ms{{log="{log_label}",quantile="{q}"}} {value:.2f}')
+    lines += [
+        '# HELP stress_transactions_total Transactions read from the log by status.',
+        '# TYPE stress_transactions_total counter',
+        f'stress_transactions_total{{log="{log_label}",status="success"}} {snapshot["success_total"]}',
+        f'stress_transactions_total{{log="{log_label}",status="error"}} {snapshot["error_total"]}',
+        '# HELP stress_method_success_total Successful transactions per contract method.',
+        '# TYPE stress_method_success_total counter',
+    ]
+    for method, count in sorted(snapshot['success_by_method'].items()):
+        lines.append(f'stress_method_success_total{{log="{log_label}",method="{method}"}} {count}')
+    lines += [
+        '# HELP stress_method_avg_latency_ms Average latency per contract method since start.',
+        '# TYPE stress_method_avg_latency_ms gauge',
+    ]
+    for method, value in sorted(snapshot['avg_latency_by_method_ms'].items()):
+        lines.append(f'stress_method_avg_latency_ms{{log="{log_label}",method="{method}"}} {value:.2f}')
+    lines += [
+        '# HELP stress_last_block Highest block number seen in the log.',
+        '# TYPE stress_last_block gauge',
+        f'stress_last_block{{log="{log_label}"}} {snapshot["last_block"]}',
+        '# HELP stress_last_block_size_bytes Size of the highest block seen in the log.',
+        '# TYPE stress_last_block_size_bytes gauge',
+        f'stress_last_block_size_bytes{{log="{log_label}"}} {snapshot["last_block_size"]}',
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def format_dashboard(snapshot, log_path):
+    """Renders a metrics snapshot as a plain-text terminal dashboard."""
+    p = snapshot['latency_percentiles_ms']
+    output = f"--- Live Stress Metrics: {log_path} ---\n"
+    output += f"Rolling TPS:        {snapshot['rolling_tps']:.2f}\n"
+    output += (f"Latency (last {snapshot['latency_window_size']}): "
+               + ', '.join(f"p{int(q * 100)}={v:.0f}ms" for q, v in p.items()) + "\n")
+    output += f"Confirmed / Failed: {snapshot['success_total']} / {snapshot['error_total']}\n"
+    output += f"Last Block:         {snapshot['last_block']} ({snapshot['last_block_size']} bytes)\n"
+    output += "---------------------------------------------------------\n"
+    methods = snapshot['success_by_method']
+    if methods:
+        width = max(len(m) for m in methods)
+        for method in sorted(methods):
+            avg = snapshot['avg_latency_by_method_ms'].get(method, 0)
+            output += f"{method.ljust(width)} | {methods[method]:>8} tx | avg {avg:.0f} ms\n"
+    else:
+        output += "Waiting for confirmed transactions...\n"
+    return output
+
+
+def find_latest_log(pattern):
+    matches = glob.glob(pattern)
+    if not matches:
+        return None
+    return max(matches, key=os.path.getmtime)
+
+
+def start_metrics_server(current, host, port):
+    """Serves /metrics for current['metrics'] and current['log_path'], which main() swaps between runs."""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') not in ('', '/metrics'):
+                self.send_error(404)
+                return
+            metrics, log_path = current['metrics'], current['log_path']
+            body = format_prometheus(metrics.snapshot(), log_path).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass # Keep the terminal dashboard readable
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tail a growing throughput log and expose rolling metrics.")
+    parser.add_argument('log', nargs='?', help=f"Log CSV to follow (default: newest file matching '{default_log_pattern}')")
+    parser.add_argument('--interval', type=float, default=1.0, help="Polling interval in seconds")
+    parser.add_argument('--window', type=float, default=default_tps_window_s, help="Rolling TPS window in seconds")
+    parser.add_argument('--latency-samples', type=int, default=default_latency_samples,
+                        help="Number of recent latencies used for percentiles")
+    parser.add_argument('--host', default='127.0.0.1', help="Metrics endpoint bind address")
+    parser.add_argument('--port', type=int, default=9464, help="Metrics endpoint port (0 disables it)")
+    parser.add_argument('--no-dashboard', action='store_true', help="Only serve the metrics endpoint")
+    args = parser.parse_args()
+
+    log_path = args.log
+    while log_path is None:
+        log_path = find_latest_log(default_log_pattern)
+        if log_path is None:
+            print(f"Waiting for a log matching '{default_log_pattern}'...")
+            time.sleep(args.interval)
+
+    tailer = LogTailer(log_path)
+    current = {'metrics': RollingMetrics(args.window, args.latency_samples), 'log_path': log_path}
+
+    if args.port:
+        start_metrics_server(current, args.host, args.port)
+        print(f"Serving metrics on http://{args.host}:{args.port}/metrics")
+
+    try:
+        while True:
+            # Without an explicit log, switch to a newer one as soon as the next run creates it
+            newest = None if args.log else find_latest_log(default_log_pattern)
+            if newest and newest != tailer.path:
+                tailer = LogTailer(newest)
+            runs = tailer.runs
+            rows = tailer.poll()
+            if tailer.path != current['log_path'] or tailer.runs != runs:
+                current['metrics'] = RollingMetrics(args.window, args.latency_samples)
+                current['log_path'] = tailer.path
+            current['metrics'].update(rows)
+            if not args.no_dashboard:
+                sys.stdout.write('\x1b[2J\x1b[H' + format_dashboard(current['metrics'].snapshot(), tailer.path))
+                sys.stdout.flush()
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
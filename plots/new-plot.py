@@ -1,9 +1,12 @@
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
+import argparse
 import json
 import os
 
+from stage_timer import StageTimer, add_profile_argument
+
 # --- Configuration ---
 # Define the number of flows for each test run (ensure you run JS script for each!)
 flows_to_test = [500, 1000, 2000, 5000, 10000] # Example flow counts - ENSURE THIS MATCHES YOUR DATA
@@ -46,6 +49,13 @@ average_block_size_data = []
 max_block_size_data = []
 average_block_time_data = [] # For Consensus Mechanism Efficiency
 
+# --- Instrumentation ---
+# Every run writes timing_report_new-plot.json; --profile adds memory peaks and a profile dump
+parser = argparse.ArgumentParser(description="Plot IPFS stress test results across test sizes.")
+add_profile_argument(parser)
+args = parser.parse_args()
+timer = StageTimer('new-plot', profile=args.profile)
+
 print("Loading data from JSON and CSV files...")
 for flows in flows_to_test:
     json_file_path = f'results_{flows}_flows.json'
@@ -66,8 +76,9 @@ for flows in flows_to_test:
         average_block_time_data.append(0)
         continue
 
-    with open(json_file_path, 'r') as f:
-        data = json.load(f)
+    with timer.stage('load'):
+        with open(json_file_path, 'r') as f:
+            data = json.load(f)
 
     overall_tps_data.append(data['overallTps'])
     overall_average_latency_data.append(data['averageLatencyMs'])
@@ -87,8 +98,10 @@ for flows in flows_to_test:
             all_latency_data[method].append(0)
     else:
         try:
-            df_log = pd.read_csv(csv_file_path)
-            avg_latencies_from_csv = df_log[df_log['Status'] == 'SUCCESS'].groupby('Method')['LatencyMs'].mean().to_dict()
+            with timer.stage('load'):
+                df_log = pd.read_csv(csv_file_path)
+            with timer.stage('aggregate'):
+                avg_latencies_from_csv = df_log[df_log['Status'] == 'SUCCESS'].groupby('Method')['LatencyMs'].mean().to_dict()
             for method in method_names:
                 latency_val = avg_latencies_from_csv.get(method, 0)
                 all_latency_data[method].append(latency_val)
@@ -105,6 +118,7 @@ x_ticks = np.arange(len(flows_to_test))
 bar_width = 0.15 
 colors = plt.cm.tab10.colors # Use a colormap for distinct colors
 
+@timer.timed('render')
 def plot_bar_chart(data, title, y_label, filename, per_method=True):
     fig, ax = plt.subplots(figsize=(15, 7))
     all_values = [] # Collect all values for scaling
@@ -163,9 +177,11 @@ def plot_bar_chart(data, title, y_label, filename, per_method=True):
         ax.set_ylim(bottom=0, top=1) # Default for empty data
 
     fig.tight_layout()
-    plt.savefig(filename)
+    with timer.stage('write'):
+        plt.savefig(filename)
     print(f"Plot saved as '{filename}'")
 
+@timer.timed('render')
 def plot_line_chart(x_data, y_data, title, x_label, y_label, filename, color='skyblue'):
     fig, ax = plt.subplots(figsize=(10, 6))
     ax.plot(x_data, y_data, marker='o', linestyle='-', color=color, linewidth=2, markersize=8)
@@ -197,7 +213,8 @@ def plot_line_chart(x_data, y_data, title, x_label, y_label, filename, color='sk
     else:
         ax.set_ylim(bottom=0, top=1) # Default for empty data
 
-    plt.savefig(filename)
+    with timer.stage('write'):
+        plt.savefig(filename)
     print(f"Plot saved as '{filename}'")
 
 
@@ -247,6 +264,7 @@ plot_line_chart(flows_to_test, average_block_time_data, 'Average Block Time (Con
                 'average_block_time_consensus.png', 'orange')
 
 
+timer.finish()
 plt.show() # Display all generated plots
 
 # --- Final Results Summary ---
@@ -0,0 +1,145 @@
+"""
+Lightweight self-timing for the analysis scripts.
+
+Every run records wall and CPU time per stage (load, aggregate, render, write) and writes a
+machine-readable report. Detailed mode (--profile) additionally tracks the tracemalloc peak per
+stage and dumps a cProfile (or pyinstrument, if installed) profile of the whole run.
+"""
+import cProfile
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+profilers = ['cprofile', 'pyinstrument']
+
+
+def add_profile_argument(parser):
+    """Adds the shared --profile switch to a script's argument parser."""
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=profilers,
+                        help="Detailed mode: per-stage memory peaks and a profile dump (default: cprofile)")
+
+
+class StageTimer:
+    def __init__(self, name, profile=None, report_dir='.'):
+        self.name = name
+        self.profile = profile
+        self.report_dir = report_dir
+        self.stages = {}
+        self.active = []
+        self.traced_peak_mb = 0.0
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        self.profiler = None
+
+        if self.profile:
+            tracemalloc.start()
+            if self.profile == 'pyinstrument':
+                try:
+                    from pyinstrument import Profiler
+                    self.profiler = Profiler()
+                except ImportError:
+                    print("Warning: pyinstrument is not installed. Falling back to cProfile.")
+                    self.profile = 'cprofile'
+            if self.profile == 'cprofile':
+                self.profiler = cProfile.Profile()
+            if self.profile == 'pyinstrument':
+                self.profiler.start()
+            else:
+                self.profiler.enable()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Times the enclosed block. Repeated stages with the same name are accumulated, and time spent
+        in nested stages is excluded from the enclosing one so that stage totals add up.
+        """
+        frame = {'nested_wall': 0.0, 'nested_cpu': 0.0, 'peak': 0}
+        if self.profile:
+            # Resetting the peak would lose the enclosing stage's peak so far, so save it first
+            peak = tracemalloc.get_traced_memory()[1]
+            if self.active:
+                self.active[-1]['peak'] = max(self.active[-1]['peak'], peak)
+            self.traced_peak_mb = max(self.traced_peak_mb, peak / 2 ** 20)
+            tracemalloc.reset_peak()
+        self.active.append(frame)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            self.active.pop()
+            if self.active:
+                self.active[-1]['nested_wall'] += wall
+                self.active[-1]['nested_cpu'] += cpu
+
+            entry = self.stages.setdefault(name, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+            entry['calls'] += 1
+            entry['wall_s'] += wall - frame['nested_wall']
+            entry['cpu_s'] += cpu - frame['nested_cpu']
+            if self.profile:
+                peak_mb = max(frame['peak'], tracemalloc.get_traced_memory()[1]) / 2 ** 20
+                entry['peak_mb'] = max(entry.get('peak_mb', 0.0), peak_mb)
+                self.traced_peak_mb = max(self.traced_peak_mb, peak_mb)
+
+    def timed(self, name):
+        """Decorator form of stage()."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def finish(self):
+        """Stops profiling, writes the timing report and returns its path."""
+        report = {
+            'script': self.name,
+            'started_at': self.started_at.isoformat(),
+            'total_wall_s': time.perf_counter() - self.started,
+            'total_cpu_s': time.process_time() - self.cpu_started,
+            'python': sys.version.split()[0],
+            'argv': sys.argv[1:],
+            'stages': self.stages,
+        }
+        if resource is not None:
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # ru_maxrss is in kilobytes on Linux and bytes on macOS
+            report['max_rss_mb'] = max_rss / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+
+        if self.profile:
+            # Stages reset the tracemalloc peak, so combine their peaks with the one since the last stage
+            report['traced_peak_mb'] = max(self.traced_peak_mb, tracemalloc.get_traced_memory()[1] / 2 ** 20)
+            tracemalloc.stop()
+            if self.profile == 'pyinstrument':
+                self.profiler.stop()
+                profile_path = os.path.join(self.report_dir, f'profile_{self.name}.html')
+                with open(profile_path, 'w', encoding='utf-8') as f:
+                    f.write(self.profiler.output_html())
+            else:
+                self.profiler.disable()
+                profile_path = os.path.join(self.report_dir, f'profile_{self.name}.prof')
+                self.profiler.dump_stats(profile_path)
+            report['profile_dump'] = profile_path
+            print(f"Profile saved to '{profile_path}'")
+
+        report_path = os.path.join(self.report_dir, f'timing_report_{self.name}.json')
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        summary = ', '.join(f"{stage} {entry['wall_s']:.2f}s" for stage, entry in self.stages.items())
+        print(f"Timing report saved to '{report_path}' ({summary})")
+        return report_path
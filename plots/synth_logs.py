@@ -0,0 +1,167 @@
+"""
+Synthetic inputs for benchmarking the analysis scripts.
+
+Throughput logs use the exact column layout written by stresstesting/fin-test.js and
+stresstesting/zkp-test.js, and Slither reports follow the layout of `slither . --json`.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+log_columns = ['TxID', 'Method', 'Sender', 'TxHash', 'StartTime', 'EndTime',
+               'LatencyMs', 'BlockNumber', 'Status', 'EstimatedGas', 'GasUsed', 'BlockSize']
+
+# (TxID prefix, method, sender role, measured GasUsed) for each transaction of one flow
+flow_layouts = {
+    'zkp': [
+        ('P7_StoreProof', 'storeProof', 'user', 28152),
+        ('P14_ApplyLoan', 'applyForLoan', 'user', 22150),
+    ],
+    'ipfs': [
+        ('P9_P10_ReqAccess', 'requestUserAccess', 'bank', 48835),
+        ('P11_GrantPersonal', 'grantAccess', 'user', 43816),
+        ('P11_GrantFinancial', 'grantAccess', 'user', 43816),
+        ('P13_ApproveLoan', 'approveLoan', 'bank', 259804),
+    ],
+}
+bank_address = '0xF4b7b68285094f8d2Fe598D4f735a59BCaB32bB9'
+user_addresses = ['0xb38B4E1213c062905FC1A5CD17881382deDF8997', '0xb2AaBba6EE87642EC287a7A44035dC0d1582C628']
+
+txs_per_block = 52
+block_time_ms = 2900.0
+batch_size = 50 # Transactions the JS scripts send concurrently before awaiting confirmations
+error_message = 'Transaction was not mined within 750 seconds'
+write_chunk_rows = 500000
+
+impacts = ['High', 'Medium', 'Low', 'Informational', 'Optimization']
+impact_weights = [0.03, 0.08, 0.09, 0.75, 0.05]
+confidences = ['High', 'Medium', 'Low']
+checks = ['reentrancy-eth', 'incorrect-exp', 'divide-before-multiply', 'naming-convention',
+          'solc-version', 'missing-zero-check', 'low-level-calls', 'external-function']
+contract_names = ['AccessControl', 'BankContract', 'LoanContract', 'LoanEligibilityVerifier',
+                  'MortgageContract', 'MortgageLoanContract']
+
+
+def _random_hashes(rng, count):
+    hex_digits = rng.bytes(32 * count).hex()
+    return ['0x' + hex_digits[i * 64:(i + 1) * 64] for i in range(count)]
+
+
+def _log_chunk(rng, kind, first_row, rows, error_rate):
+    layout = flow_layouts[kind]
+    index = np.arange(first_row, first_row + rows)
+    flow, step = np.divmod(index, len(layout))
+
+    prefixes = np.array([entry[0] for entry in layout])[step]
+    methods = np.array([entry[1] for entry in layout])[step]
+    is_bank = np.array([entry[2] == 'bank' for entry in layout])[step]
+    users = np.array(user_addresses)[flow % len(user_addresses)]
+    senders = np.where(is_bank, bank_address, users)
+    gas = np.array([entry[3] for entry in layout])[step] + rng.integers(-12, 13, size=rows)
+
+    # Batches are sent together and confirm within a few blocks; latency creeps up over the run
+    batch = index // batch_size
+    start = 10000.0 + batch * block_time_ms * 1.5 + rng.random(rows) * 50
+    latency = block_time_ms * (1 + rng.integers(0, 4, size=rows)) * (1 + index / 2e6) + rng.random(rows) * 20
+    block = 400 + index // txs_per_block
+    block_size = 21000 + (block % 7) * 250
+
+    failed = rng.random(rows) < error_rate
+    chunk = pd.DataFrame({
+        'TxID': np.char.add(np.char.add(prefixes, '_'), flow.astype(str)),
+        'Method': methods,
+        'Sender': senders,
+        'TxHash': _random_hashes(rng, rows),
+        'StartTime': start.round(6),
+        'EndTime': (start + latency).round(6),
+        'LatencyMs': latency.round(2),
+        'BlockNumber': block.astype(object),
+        'Status': 'SUCCESS',
+        'EstimatedGas': gas.astype(object),
+        'GasUsed': gas.astype(object),
+        'BlockSize': block_size.astype(object),
+    }, columns=log_columns)
+
+    # Failed sends are logged as "<TxID>,<Method>,<Sender>,ERROR,<start>,<end>,<latency>,,<message>"
+    if failed.any():
+        chunk.loc[failed, 'TxHash'] = 'ERROR'
+        chunk.loc[failed, 'BlockNumber'] = ''
+        chunk.loc[failed, 'Status'] = error_message
+        chunk.loc[failed, ['EstimatedGas', 'GasUsed', 'BlockSize']] = None
+    return chunk
+
+
+def write_throughput_log(path, rows, kind='zkp', error_rate=0.0, seed=0):
+    """Writes a synthetic `<kind>_throughput_log_*.csv` with `rows` transactions, streaming in chunks."""
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', newline='') as f:
+        f.write(','.join(log_columns) + '\n')
+        for first_row in range(0, rows, write_chunk_rows):
+            chunk = _log_chunk(rng, kind, first_row, min(write_chunk_rows, rows - first_row), error_rate)
+            csv_text = chunk.to_csv(header=False, index=False)
+            # Error rows end after the message, like the JS scripts write them
+            f.write(csv_text.replace(f'{error_message},,,\n', f'{error_message}\n'))
+    return path
+
+
+def slither_report(detectors, seed=0):
+    """Builds a Slither JSON report with `detectors` findings."""
+    rng = np.random.default_rng(seed)
+    findings = []
+    for i in range(detectors):
+        contract = contract_names[rng.integers(len(contract_names))]
+        function = f'function{rng.integers(40)}'
+        filename = f'contracts/{contract}.sol'
+        first_line = int(rng.integers(1, 400))
+        lines = list(range(first_line, first_line + int(rng.integers(1, 30))))
+        source_mapping = {
+            'start': first_line * 40, 'length': len(lines) * 40,
+            'filename_relative': filename, 'filename_short': filename,
+            'is_dependency': False, 'lines': lines, 'starting_column': 5, 'ending_column': 6,
+        }
+        check = checks[rng.integers(len(checks))]
+        description = f'{contract}.{function}() ({filename}#{lines[0]}-{lines[-1]}) triggers {check}:\n\t- <detail>\n'
+        findings.append({
+            'elements': [
+                {'type': 'function', 'name': function, 'source_mapping': source_mapping,
+                 'type_specific_fields': {'parent': {'type': 'contract', 'name': contract}}},
+                {'type': 'node', 'name': f'statement {i}', 'source_mapping': source_mapping},
+            ],
+            'description': description,
+            'markdown': description,
+            'first_markdown_element': f'{filename}#L{lines[0]}-L{lines[-1]}',
+            'id': rng.bytes(32).hex(),
+            'check': check,
+            'impact': impacts[rng.choice(len(impacts), p=impact_weights)],
+            'confidence': confidences[rng.integers(len(confidences))],
+        })
+    return {'success': True, 'error': None, 'results': {'detectors': findings}}
+
+
+def write_slither_results(path, detectors, seed=0):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(slither_report(detectors, seed), f)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic throughput logs or Slither reports.")
+    parser.add_argument('output', help="Output file")
+    parser.add_argument('--kind', choices=['zkp', 'ipfs', 'slither'], default='zkp')
+    parser.add_argument('--rows', type=int, default=10000, help="Log rows, or detectors for --kind slither")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of failed transactions")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.kind == 'slither':
+        write_slither_results(args.output, args.rows, args.seed)
+    else:
+        write_throughput_log(args.output, args.rows, args.kind, args.error_rate, args.seed)
+    print(f"Synthetic data saved to '{os.path.abspath(args.output)}'")
+
+
+if __name__ == "__main__":
+    main()
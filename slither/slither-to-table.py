@@ -1,25 +1,17 @@
+import argparse
 import json
 import os
+import sys
 
-def slither_json_to_html_table(json_file_path="results.json", output_html_path="slither_results.html"):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plots'))
+from stage_timer import StageTimer, add_profile_argument
+
+def extract_findings(data):
     """
-    Reads a Slither JSON report, formats it into an HTML table,
-    and saves it to an HTML file.
+    Flattens the detector results of a Slither report into one row per finding.
+    Returns None when the report has no detector results.
     """
-    try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: JSON file '{json_file_path}' not found.")
-        return
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from '{json_file_path}'. Is it valid JSON?")
-        return
-
     findings = []
-    # Define headers for the HTML table
-    headers = ["ID", "Detector", "Impact", "Confidence", "Contract", "Function", "Description", "Line(s)"]
-
     if 'results' in data and 'detectors' in data['results']:
         for i, finding in enumerate(data['results']['detectors']):
             detector_name = finding.get('detector', '<N/A>')
@@ -55,12 +47,11 @@ def slither_json_to_html_table(json_file_path="results.json", output_html_path="
             })
     else:
         print("No 'detectors' results found in the JSON file. Ensure it's a valid Slither output.")
-        return
-
-    if not findings:
-        print("No findings with 'detectors' results were found to generate a table.")
-        return
+        return None
+    return findings
 
+def findings_to_html(findings, headers):
+    """Renders the findings as a standalone HTML page."""
     # --- Generate HTML ---
     html_content = """
     <!DOCTYPE html>
@@ -138,10 +129,42 @@ def slither_json_to_html_table(json_file_path="results.json", output_html_path="
     </body>
     </html>
     """
+    return html_content
+
+def slither_json_to_html_table(json_file_path="results.json", output_html_path="slither_results.html", timer=None):
+    """
+    Reads a Slither JSON report, formats it into an HTML table,
+    and saves it to an HTML file. Stage timings are recorded on `timer` when given.
+    """
+    timer = timer or StageTimer('slither-to-table')
+    try:
+        with timer.stage('load'), open(json_file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: JSON file '{json_file_path}' not found.")
+        return
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from '{json_file_path}'. Is it valid JSON?")
+        return
+
+    # Define headers for the HTML table
+    headers = ["ID", "Detector", "Impact", "Confidence", "Contract", "Function", "Description", "Line(s)"]
+
+    with timer.stage('aggregate'):
+        findings = extract_findings(data)
+    if findings is None:
+        return
+
+    if not findings:
+        print("No findings with 'detectors' results were found to generate a table.")
+        return
+
+    with timer.stage('render'):
+        html_content = findings_to_html(findings, headers)
 
     # Save the HTML to a file
     try:
-        with open(output_html_path, 'w', encoding='utf-8') as f:
+        with timer.stage('write'), open(output_html_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
         print(f"HTML table successfully saved to '{output_html_path}'")
         print(f"You can open '{output_html_path}' in your web browser to view the results.")
@@ -152,5 +175,11 @@ if __name__ == "__main__":
     # 1. Run Slither to generate your JSON report (if you haven't already):
     #    slither . --json results.json
 
-    # 2. Then, run this Python script:
-    slither_json_to_html_table("results.json", "slither_results_table.html")
\ No newline at end of file
+    # 2. Then, run this Python script (add --profile for memory peaks and a profile dump):
+    parser = argparse.ArgumentParser(description="Convert a Slither JSON report into an HTML table.")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    timer = StageTimer('slither-to-table', profile=args.profile)
+    slither_json_to_html_table("results.json", "slither_results_table.html", timer=timer)
+    timer.finish()
\ No newline at end of file